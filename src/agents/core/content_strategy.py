@@ -19,6 +19,14 @@ except (ValueError, KeyError) as e:
     # In a real app, you might want to exit or handle this more gracefully
     exit()
 
+# Static instructions, sent as an identical leading system message on every call so the
+# provider can reuse its cached prompt prefix; only the user turn varies
+IDEAS_INSTRUCTIONS = (
+    "You are a world-class content strategist. Your task is to generate 5-7 distinct and creative content ideas based on the following topic and trend analysis. "
+    "Focus on ideas that are engaging, shareable, and aligned with the topic. Present the ideas as a numbered list. "
+    "The ideas should be specific and actionable. All output must be in Greek."
+)
+
 class ContentStrategyAgent(BaseAgent):
     """
     An agent that generates content ideas based on a given topic using the Groq API.
@@ -56,18 +64,16 @@ class ContentStrategyAgent(BaseAgent):
             print("Trend analysis report found, using it for context.")
             prompt_context += f"\nΑναφορά Τάσεων:\n{trend_report}"
 
-        prompt = (
-            f"You are a world-class content strategist. Your task is to generate 5-7 distinct and creative content ideas based on the following topic and trend analysis. "
-            f"Focus on ideas that are engaging, shareable, and aligned with the topic. Present the ideas as a numbered list. "
-            f"The ideas should be specific and actionable. All output must be in Greek.\n\n"
-            f"{prompt_context}"
-            f"\n--- 5 CONTENT IDEAS (in Greek) ---"
-        )
+        prompt = f"{prompt_context}\n--- 5 CONTENT IDEAS (in Greek) ---"
 
         ideas = []
         try:
             chat_completion = client.chat.completions.create(
                 messages=[
+                    {
+                        "role": "system",
+                        "content": IDEAS_INSTRUCTIONS,
+                    },
                     {
                         "role": "user",
                         "content": prompt,
@@ -4,7 +4,7 @@ from groq import Groq
 import asyncio
 from typing import Dict, Any
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, shared_http_client
 
 # Load environment variables
 load_dotenv()
@@ -13,7 +13,7 @@ load_dotenv()
 api_key = os.getenv("GROQ_API_KEY")
 if not api_key:
     raise ValueError("GROQ_API_KEY not found in .env file")
-client = Groq(api_key=api_key)
+client = Groq(api_key=api_key, http_client=shared_http_client())
 
 class ContentWriterAgent(EnhancedBaseAgent):
     """
@@ -54,7 +54,9 @@ class ContentWriterAgent(EnhancedBaseAgent):
         )
 
         try:
-            chat_completion = client.chat.completions.create(
+            # The Groq client is blocking; run it in a thread so concurrent writers overlap
+            chat_completion = await self._call_llm(
+                client.chat.completions.create,
                 messages=[
                     {
                         "role": "user",
@@ -7,9 +7,38 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 import logging
 import asyncio
+import atexit
+import functools
+import hashlib
+import os
+import shelve
+import threading
 from datetime import datetime
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+import httpx
+
+# Serializes access to response cache files shared by agents in this process
+_response_cache_lock = threading.Lock()
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def shared_http_client() -> httpx.Client:
+    """
+    Process-wide HTTP client for the agents' LLM SDK clients, so every agent draws on one
+    keep-alive connection pool instead of opening its own connections
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=60
+            )
+            atexit.register(_http_client.close)
+        return _http_client
 
 @dataclass
 class AgentMetrics:
@@ -26,9 +55,16 @@ class AgentConfig:
     model_name: str = "deepseek-r1-distill-llama-70b"
     temperature: float = 0.7
     max_tokens: int = 2000
+    # Seconds each LLM call may take once it holds a concurrency permit
     timeout: int = 30
     retry_count: int = 3
     retry_delay: float = 1.0
+    # Path of a persistent LLM response cache; identical requests are answered from it.
+    # Defaults to $AGENT_RESPONSE_CACHE, and caching is off when neither is set.
+    response_cache_path: Optional[str] = field(default_factory=lambda: os.environ.get("AGENT_RESPONSE_CACHE"))
+    # Upper bound on this agent's in-flight LLM calls; an orchestrator replaces the semaphore
+    # with one shared by all of its agents. Defaults to $MAX_LLM_CONCURRENCY, else 8.
+    max_concurrent_llm_calls: int = field(default_factory=lambda: int(os.environ.get("MAX_LLM_CONCURRENCY", "8")))
 
 class EnhancedBaseAgent(ABC):
     """
@@ -47,13 +83,16 @@ class EnhancedBaseAgent(ABC):
         )
         self.logger = self._setup_logger()
         self.memory = {}
+        self.llm_semaphore = asyncio.Semaphore(self.config.max_concurrent_llm_calls)
         
     def _setup_logger(self) -> logging.Logger:
         """Setup dedicated logger for this agent"""
         logger = logging.getLogger(f"agent.{self.name}")
         logger.setLevel(logging.INFO)
         
-        if not logger.handlers:
+        # Attach a console handler only when the application hasn't configured logging itself;
+        # otherwise records propagate to its root handlers
+        if not logger.handlers and not logging.getLogger().handlers:
             handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -95,7 +134,7 @@ class EnhancedBaseAgent(ABC):
         
         for attempt in range(self.config.retry_count + 1):
             try:
-                return await self._execute_with_timeout(state)
+                return await self._execute_core(state)
             except Exception as e:
                 last_error = e
                 if attempt < self.config.retry_count:
@@ -104,15 +143,78 @@ class EnhancedBaseAgent(ABC):
         
         raise last_error
     
-    async def _execute_with_timeout(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute with timeout protection"""
+    def _build_messages(self, instructions: str, request: str) -> List[Dict[str, Any]]:
+        """
+        Assemble chat messages from static instructions and the per-call request.
+        The instructions lead the single user message (R1 models are prompted without a system
+        message), so they form a prefix the provider can reuse from its prompt cache; keep
+        timestamps and other per-call values out of them.
+        """
+        return [{"role": "user", "content": f"{instructions}\n\n{request}"}]
+    
+    async def _call_llm(self, func, *args, **kwargs):
+        """
+        Run a blocking LLM client call in a worker thread, bounded by the LLM semaphore.
+        The timeout starts once a permit is held, so queueing behind other calls doesn't count.
+        A timed-out call can't stop its thread, so the permit is only released when the thread
+        finishes; retries wait for it rather than exceeding the bound.
+        """
+        semaphore = self.llm_semaphore
+        await semaphore.acquire()
         try:
-            return await asyncio.wait_for(
-                self._execute_core(state),
-                timeout=self.config.timeout
-            )
+            call = asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        call.add_done_callback(functools.partial(self._release_llm_permit, semaphore))
+        
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout=self.config.timeout)
         except asyncio.TimeoutError:
-            raise TimeoutError(f"Agent execution timed out after {self.config.timeout}s")
+            raise TimeoutError(f"LLM call timed out after {self.config.timeout}s")
+    
+    def _release_llm_permit(self, semaphore: asyncio.Semaphore, call: asyncio.Future):
+        """Return the permit of a finished LLM call, retrieving any error nobody awaits anymore"""
+        semaphore.release()
+        if not call.cancelled():
+            call.exception()
+    
+    async def _create_completion(self, messages: List[Dict[str, Any]], **params) -> str:
+        """
+        Request a chat completion from the agent's client (set by subclasses) and return its text.
+        Model, temperature and max_tokens default to the agent config; repeats of an identical
+        request are served from the response cache when one is configured.
+        """
+        params = {
+            "model": self.config.model_name,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            **params
+        }
+        
+        cache_path = self.config.response_cache_path
+        key = None
+        if cache_path:
+            key = hashlib.sha256(
+                json.dumps([messages, params], sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            with _response_cache_lock, shelve.open(cache_path) as cache:
+                if key in cache:
+                    self.logger.info("Response cache hit")
+                    return cache[key]
+        
+        response = await self._call_llm(self.client.chat.completions.create, messages=messages, **params)
+        content = response.choices[0].message.content
+        
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens:
+            self.logger.info(f"Prompt cache: {cached_tokens} cached input tokens")
+        
+        if key is not None:
+            with _response_cache_lock, shelve.open(cache_path) as cache:
+                cache[key] = content
+        return content
     
     @abstractmethod
     async def _execute_core(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -9,10 +9,58 @@ from typing import Dict, Any, List
 from dotenv import load_dotenv
 from groq import Groq
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, AgentConfig
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, AgentConfig, shared_http_client
 
 load_dotenv()
 
+# Static parts of the strategy and calendar prompts, kept identical across calls for prompt caching
+CONTENT_STRATEGY_INSTRUCTIONS = """
+You are a world-class content strategist with expertise in data-driven marketing.
+
+Create a comprehensive content strategy for the given topic, audience and goals.
+
+Structure your response as:
+
+## 🎯 Στρατηγική Στόχευσης
+- Primary audience personas
+- Key messaging pillars
+- Brand voice guidelines
+
+## 📋 Content Pillars
+5-7 distinct content themes with:
+- Description and purpose
+- Content formats for each
+- Posting frequency recommendations
+
+## 🎨 Content Formats & Channels
+- Platform-specific recommendations
+- Format mix (video, carousel, stories, etc.)
+- Optimal posting times
+
+## 📊 KPIs & Metrics
+- Success metrics for each goal
+- Benchmark targets
+- Tracking methodology
+
+## 🔄 Content Lifecycle
+- Creation workflow
+- Approval process
+- Repurposing strategy
+
+Make it actionable, specific, and tailored to Greek audiences.
+"""
+
+CONTENT_CALENDAR_INSTRUCTIONS = """
+Based on the given content strategy, create a 30-day content calendar with:
+- Daily content ideas (mix of formats)
+- Platform recommendations
+- Key themes rotation
+- Special dates/holidays consideration
+
+Format as a structured list with:
+Day | Content Type | Platform | Theme | Brief Description
+"""
+
 class EnhancedContentStrategyAgent(EnhancedBaseAgent):
     """
     Enhanced content strategy agent with trend integration and advanced planning
@@ -26,7 +74,7 @@ class EnhancedContentStrategyAgent(EnhancedBaseAgent):
         if not self.api_key:
             raise ValueError("GROQ_API_KEY not found in .env file")
             
-        self.client = Groq(api_key=self.api_key)
+        self.client = Groq(api_key=self.api_key, http_client=shared_http_client())
         self.logger.info("Enhanced Content Strategy Agent initialized successfully")
     
     async def _execute_core(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,56 +114,17 @@ class EnhancedContentStrategyAgent(EnhancedBaseAgent):
                                      audience: str, goals: List[str]) -> Dict[str, Any]:
         """Generate comprehensive content strategy"""
         
-        prompt = f"""
-        You are a world-class content strategist with expertise in data-driven marketing.
-        
+        request = f"""
         Create a comprehensive content strategy for:
         Topic: {topic}
         Target Audience: {audience}
         Goals: {', '.join(goals)}
-        
-        {f"Trend Analysis Context:\n{trends}" if trends else ""}
-        
-        Structure your response as:
-        
-        ## 🎯 Στρατηγική Στόχευσης
-        - Primary audience personas
-        - Key messaging pillars
-        - Brand voice guidelines
-        
-        ## 📋 Content Pillars
-        5-7 distinct content themes with:
-        - Description and purpose
-        - Content formats for each
-        - Posting frequency recommendations
-        
-        ## 🎨 Content Formats & Channels
-        - Platform-specific recommendations
-        - Format mix (video, carousel, stories, etc.)
-        - Optimal posting times
-        
-        ## 📊 KPIs & Metrics
-        - Success metrics for each goal
-        - Benchmark targets
-        - Tracking methodology
-        
-        ## 🔄 Content Lifecycle
-        - Creation workflow
-        - Approval process
-        - Repurposing strategy
-        
-        Make it actionable, specific, and tailored to Greek audiences.
         """
+        if trends:
+            request += f"\nTrend Analysis Context:\n{trends}\n"
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.config.model_name,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens
-            )
-            
-            strategy_text = response.choices[0].message.content
+            strategy_text = await self._create_completion(self._build_messages(CONTENT_STRATEGY_INSTRUCTIONS, request))
             cleaned_strategy = self._clean_response(strategy_text)
             
             # Parse into structured format
@@ -128,29 +137,17 @@ class EnhancedContentStrategyAgent(EnhancedBaseAgent):
     async def _create_content_calendar(self, strategy: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create a 30-day content calendar based on strategy"""
         
-        prompt = f"""
+        request = f"""
         Based on the following content strategy:
         {strategy.get('raw_text', '')}
-        
-        Create a 30-day content calendar with:
-        - Daily content ideas (mix of formats)
-        - Platform recommendations
-        - Key themes rotation
-        - Special dates/holidays consideration
-        
-        Format as a structured list with:
-        Day | Content Type | Platform | Theme | Brief Description
         """
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.config.model_name,
+            calendar_text = await self._create_completion(
+                self._build_messages(CONTENT_CALENDAR_INSTRUCTIONS, request),
                 temperature=0.6,
                 max_tokens=2000
             )
-            
-            calendar_text = response.choices[0].message.content
             return self._parse_calendar(calendar_text)
             
         except Exception as e:
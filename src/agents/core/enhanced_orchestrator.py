@@ -3,12 +3,16 @@ Enhanced Orchestrator integrating MasterAIOrchestrator with enhanced agents
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import hashlib
+import itertools
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 from datetime import datetime
 import json
 import logging
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent
+from pydantic import BaseModel, Field, ValidationError
+
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, AgentConfig
 from src.agents.specialists.enhanced_trend_analysis import EnhancedTrendAnalysisAgent
 from src.agents.core.enhanced_content_strategy import EnhancedContentStrategyAgent
 from src.agents.core.content_writer import ContentWriterAgent
@@ -17,15 +21,34 @@ from src.agents.specialists.image_generation import ImageGenerationAgent
 from src.agents.specialists.visual_suggestion import VisualSuggestionAgent
 from src.agents.specialists.client_briefing import ClientBriefingAgent
 
+class WorkflowConfig(BaseModel):
+    """Validated workflow configuration; defaults match what execute_workflow documents"""
+    topic: str = Field(min_length=1)
+    target_audience: str = "general"
+    content_goals: List[str] = ["engagement"]
+    platforms: List[str] = ["instagram", "facebook"]
+    duration: int = 30
+    budget: float = 1000
+
 class EnhancedOrchestrator:
     """
     Enhanced orchestrator that coordinates multiple agents with advanced features
     """
     
-    def __init__(self):
+    def __init__(self, cache_executions: bool = False):
+        """
+        Args:
+            cache_executions: Reuse the result of a completed workflow for later calls with an
+                equivalent config instead of running the agents again
+        """
         self.logger = logging.getLogger("EnhancedOrchestrator")
         self.agents = {}
         self.workflow_history = []
+        self.cache_executions = cache_executions
+        # Completed workflow results keyed by a hash of their validated config
+        self._execution_cache: Dict[str, Dict[str, Any]] = {}
+        # Keeps workflow ids unique when several workflows start within the same second
+        self._workflow_seq = itertools.count(1)
         self._initialize_agents()
         
     def _initialize_agents(self):
@@ -41,6 +64,11 @@ class EnhancedOrchestrator:
             "client_briefing": ClientBriefingAgent()
         }
         
+        # One semaphore bounds in-flight LLM calls across all agents and concurrent workflows
+        self._llm_semaphore = asyncio.Semaphore(AgentConfig().max_concurrent_llm_calls)
+        for agent in self.agents.values():
+            agent.llm_semaphore = self._llm_semaphore
+        
         self.logger.info("All enhanced agents initialized successfully")
     
     async def execute_workflow(self, workflow_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -60,8 +88,50 @@ class EnhancedOrchestrator:
             Complete workflow results with all agent outputs
         """
         
+        # The last streamed event carries the complete result
+        async for event in self.stream_workflow(workflow_config):
+            final_event = event
+        return final_event["result"]
+    
+    async def stream_workflow(self, workflow_config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a workflow like execute_workflow, yielding each phase's result as it completes
+        
+        Yields:
+            {"workflow_id", "phase", "result"} per phase, then a final event whose phase is the
+            workflow status ("completed", "failed" or "invalid_input") and whose result is the
+            complete workflow result
+        """
+        
         start_time = datetime.now()
-        workflow_id = f"workflow_{int(start_time.timestamp())}"
+        workflow_id = f"workflow_{int(start_time.timestamp())}_{next(self._workflow_seq)}"
+        
+        # Reject bad configs before any agent spends an LLM call on them
+        try:
+            config = WorkflowConfig(**workflow_config)
+        except ValidationError as e:
+            self.logger.warning(f"Workflow {workflow_id} rejected: invalid config")
+            yield {
+                "workflow_id": workflow_id,
+                "phase": "invalid_input",
+                "result": {
+                    "workflow_id": workflow_id,
+                    "status": "invalid_input",
+                    "errors": e.errors(include_url=False, include_context=False),
+                    "timestamp": datetime.now().isoformat()
+                }
+            }
+            return
+        
+        # Configs are compared after validation, so omitted fields and explicit defaults match
+        cache_key = hashlib.sha256(
+            json.dumps(config.model_dump(), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        if self.cache_executions and cache_key in self._execution_cache:
+            self.logger.info(f"Workflow {workflow_id} served from execution cache")
+            cached = self._execution_cache[cache_key]
+            yield {"workflow_id": cached["workflow_id"], "phase": cached["status"], "result": cached}
+            return
         
         self.logger.info(f"Starting enhanced workflow: {workflow_id}")
         
@@ -71,39 +141,59 @@ class EnhancedOrchestrator:
                 "workflow_id": workflow_id,
                 "start_time": start_time.isoformat(),
                 "config": workflow_config,
-                "topic": workflow_config.get("topic"),
-                "target_audience": workflow_config.get("target_audience", "general"),
-                "content_goals": workflow_config.get("content_goals", ["engagement"]),
-                "platforms": workflow_config.get("platforms", ["instagram", "facebook"]),
-                "duration": workflow_config.get("duration", 30),
-                "budget": workflow_config.get("budget", 1000)
+                **config.model_dump()
             }
             
             # Execute workflow phases
-            results = await self._execute_phases(state)
+            results = {"phases": {}}
+            async for phase, phase_result in self._stream_phases(state):
+                results["phases"][phase] = phase_result
+                yield {"workflow_id": workflow_id, "phase": phase, "result": phase_result}
             
             # Compile final results
             final_results = self._compile_results(results, workflow_id)
             
             # Store in history
             self.workflow_history.append(final_results)
+            if self.cache_executions:
+                self._execution_cache[cache_key] = final_results
             
             self.logger.info(f"Workflow {workflow_id} completed successfully")
-            return final_results
-            
+        
         except Exception as e:
             self.logger.error(f"Workflow {workflow_id} failed: {str(e)}")
-            return self._handle_workflow_error(workflow_id, str(e))
+            final_results = self._handle_workflow_error(workflow_id, str(e))
+        
+        yield {"workflow_id": workflow_id, "phase": final_results["status"], "result": final_results}
     
-    async def _execute_phases(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute workflow in phases"""
+    async def execute_workflow_batch(self, workflow_configs: List[Dict[str, Any]],
+                                     concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Execute several workflows concurrently
+        
+        Args:
+            workflow_configs: One configuration per workflow, as for execute_workflow
+            concurrency: Maximum number of workflows running at the same time
+        
+        Returns:
+            Workflow results in the same order as workflow_configs
+        """
+        
+        semaphore = asyncio.Semaphore(concurrency)
         
-        results = {"phases": {}}
+        async def run_one(workflow_config: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_workflow(workflow_config)
+        
+        return await asyncio.gather(*(run_one(config) for config in workflow_configs))
+    
+    async def _stream_phases(self, state: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Execute workflow in phases, yielding (phase name, phase result) as each one completes"""
         
         # Phase 1: Trend Analysis
         self.logger.info("Phase 1: Trend Analysis")
         trend_result = await self.agents["trend_analysis"].execute_with_metrics(state)
-        results["phases"]["trend_analysis"] = {
+        yield "trend_analysis", {
             "output": trend_result,
             "metrics": self.agents["trend_analysis"].get_metrics()
         }
@@ -111,7 +201,7 @@ class EnhancedOrchestrator:
         # Phase 2: Content Strategy
         self.logger.info("Phase 2: Content Strategy")
         strategy_result = await self.agents["content_strategy"].execute_with_metrics(trend_result)
-        results["phases"]["content_strategy"] = {
+        yield "content_strategy", {
             "output": strategy_result,
             "metrics": self.agents["content_strategy"].get_metrics()
         }
@@ -119,12 +209,12 @@ class EnhancedOrchestrator:
         # Phase 3: Content Creation
         self.logger.info("Phase 3: Content Creation")
         content_results = await self._create_content_batch(strategy_result)
-        results["phases"]["content_creation"] = content_results
+        yield "content_creation", content_results
         
         # Phase 4: Visual Assets
         self.logger.info("Phase 4: Visual Assets")
         visual_results = await self._create_visual_assets(strategy_result, content_results)
-        results["phases"]["visual_assets"] = visual_results
+        yield "visual_assets", visual_results
         
         # Phase 5: Social Media Optimization
         self.logger.info("Phase 5: Social Media Optimization")
@@ -133,7 +223,7 @@ class EnhancedOrchestrator:
             "content": content_results.get("content", []),
             "visuals": visual_results.get("visuals", [])
         })
-        results["phases"]["social_media"] = {
+        yield "social_media", {
             "output": social_results,
             "metrics": self.agents["social_media"].get_metrics()
         }
@@ -146,12 +236,10 @@ class EnhancedOrchestrator:
             "visuals": visual_results.get("visuals", []),
             "social_optimization": social_results
         })
-        results["phases"]["client_briefing"] = {
+        yield "client_briefing", {
             "output": briefing_result,
             "metrics": self.agents["client_briefing"].get_metrics()
         }
-        
-        return results
     
     async def _create_content_batch(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Create multiple content pieces based on strategy"""
@@ -162,24 +250,29 @@ class EnhancedOrchestrator:
         # Create content for first 5 days as sample
         sample_days = calendar[:5]
         
-        for day_content in sample_days:
-            try:
-                content_state = {
+        # Days are written independently, so all pieces are generated concurrently
+        content_results = await asyncio.gather(
+            *(
+                self.agents["content_writer"].execute_with_metrics({
                     **state,
                     "content_type": day_content.get("type", "post"),
                     "platform": day_content.get("platform", "instagram"),
                     "theme": day_content.get("theme", "general")
-                }
-                
-                content_result = await self.agents["content_writer"].execute_with_metrics(content_state)
-                content_pieces.append({
-                    "day": day_content.get("day"),
-                    "content": content_result.get("content", ""),
-                    "metadata": content_result
                 })
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to create content for day {day_content.get('day')}: {str(e)}")
+                for day_content in sample_days
+            ),
+            return_exceptions=True
+        )
+        
+        for day_content, content_result in zip(sample_days, content_results):
+            if isinstance(content_result, Exception):
+                self.logger.warning(f"Failed to create content for day {day_content.get('day')}: {str(content_result)}")
+                continue
+            content_pieces.append({
+                "day": day_content.get("day"),
+                "content": content_result.get("content", ""),
+                "metadata": content_result
+            })
         
         return {
             "content": content_pieces,
@@ -194,23 +287,30 @@ class EnhancedOrchestrator:
         visuals = []
         content_pieces = content_results.get("content", [])
         
-        for content in content_pieces[:3]:  # Create visuals for first 3 pieces
-            try:
-                visual_state = {
+        sample_pieces = content_pieces[:3]  # Create visuals for first 3 pieces
+        
+        # Each visual depends only on its own content piece, so they are created concurrently
+        visual_results = await asyncio.gather(
+            *(
+                self.agents["image_generation"].execute_with_metrics({
                     **state,
                     "content": content.get("content", ""),
                     "content_type": "social_media_post"
-                }
-                
-                visual_result = await self.agents["image_generation"].execute_with_metrics(visual_state)
-                visuals.append({
-                    "content_id": content.get("day"),
-                    "visual_prompt": visual_result.get("image_prompt", ""),
-                    "suggestions": visual_result.get("suggestions", [])
                 })
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to create visual for content {content.get('day')}: {str(e)}")
+                for content in sample_pieces
+            ),
+            return_exceptions=True
+        )
+        
+        for content, visual_result in zip(sample_pieces, visual_results):
+            if isinstance(visual_result, Exception):
+                self.logger.warning(f"Failed to create visual for content {content.get('day')}: {str(visual_result)}")
+                continue
+            visuals.append({
+                "content_id": content.get("day"),
+                "visual_prompt": visual_result.get("image_prompt", ""),
+                "suggestions": visual_result.get("suggestions", [])
+            })
         
         return {
             "visuals": visuals,
@@ -2,7 +2,7 @@ import os
 from dotenv import load_dotenv
 from groq import Groq
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, shared_http_client
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +12,7 @@ try:
     api_key = os.environ.get("GROQ_API_KEY")
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in .env file or is empty.")
-    client = Groq(api_key=api_key)
+    client = Groq(api_key=api_key, http_client=shared_http_client())
 except (ValueError, KeyError) as e:
     print(f"ERROR in ClientBriefingAgent: {e}")
     client = None
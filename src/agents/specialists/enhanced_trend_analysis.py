@@ -9,10 +9,37 @@ from typing import Dict, Any, List
 from dotenv import load_dotenv
 from groq import Groq
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, AgentConfig
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, AgentConfig, shared_http_client
 
 load_dotenv()
 
+# Static part of the trend analysis prompt, kept identical across calls for prompt caching
+TREND_ANALYSIS_INSTRUCTIONS = """
+You are a world-class marketing and social media analyst specializing in trend analysis.
+
+Provide a comprehensive trend analysis of the given topic in Greek with the following structure:
+
+## 📊 Τρέχουσες Τάσεις
+Identify 3-5 key current trends related to this topic
+
+## 🔮 Αναδυόμενες Τάσεις  
+Predict 2-3 emerging trends that will gain traction
+
+## 📅 Εποχιακά Μοτίβα
+Describe seasonal patterns and optimal timing opportunities
+
+## 🎯 Ευκαιρίες Περιεχομένου
+Suggest 5-7 specific content formats and ideas based on trends
+
+## 📈 Μετρήσεις Επιτυχίας
+Key metrics to track for trend-based content
+
+## ⚠️ Προειδοποιήσεις
+Potential risks or declining trends to avoid
+
+Make the analysis actionable, specific, and data-driven. Use bullet points and clear formatting.
+"""
+
 class EnhancedTrendAnalysisAgent(EnhancedBaseAgent):
     """
     Enhanced trend analysis agent with improved error handling and metrics
@@ -26,7 +53,7 @@ class EnhancedTrendAnalysisAgent(EnhancedBaseAgent):
         if not self.api_key:
             raise ValueError("GROQ_API_KEY not found in .env file")
             
-        self.client = Groq(api_key=self.api_key)
+        self.client = Groq(api_key=self.api_key, http_client=shared_http_client())
         self.logger.info("Enhanced Trend Analysis Agent initialized successfully")
     
     async def _execute_core(self, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -54,43 +81,10 @@ class EnhancedTrendAnalysisAgent(EnhancedBaseAgent):
     async def _generate_trend_analysis(self, topic: str) -> str:
         """Generate detailed trend analysis using Groq API"""
         
-        prompt = f"""
-        You are a world-class marketing and social media analyst specializing in trend analysis.
-        
-        Analyze the topic: "{topic}"
-        
-        Provide a comprehensive trend analysis in Greek with the following structure:
-        
-        ## 📊 Τρέχουσες Τάσεις
-        Identify 3-5 key current trends related to this topic
-        
-        ## 🔮 Αναδυόμενες Τάσεις  
-        Predict 2-3 emerging trends that will gain traction
-        
-        ## 📅 Εποχιακά Μοτίβα
-        Describe seasonal patterns and optimal timing opportunities
-        
-        ## 🎯 Ευκαιρίες Περιεχομένου
-        Suggest 5-7 specific content formats and ideas based on trends
-        
-        ## 📈 Μετρήσεις Επιτυχίας
-        Key metrics to track for trend-based content
-        
-        ## ⚠️ Προειδοποιήσεις
-        Potential risks or declining trends to avoid
-        
-        Make the analysis actionable, specific, and data-driven. Use bullet points and clear formatting.
-        """
+        request = f'Analyze the topic: "{topic}"'
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=self.config.model_name,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens
-            )
-            
-            raw_content = response.choices[0].message.content
+            raw_content = await self._create_completion(self._build_messages(TREND_ANALYSIS_INSTRUCTIONS, request))
             
             # Clean the response
             cleaned_content = self._clean_response(raw_content)
@@ -1,10 +1,12 @@
 import os
+import asyncio
+import uuid
 import requests
 from datetime import datetime
 from dotenv import load_dotenv
 from openai import OpenAI
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, shared_http_client
 
 # Load environment variables
 load_dotenv()
@@ -14,7 +16,7 @@ try:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not found in .env file or is empty.")
-    client = OpenAI(api_key=api_key)
+    client = OpenAI(api_key=api_key, http_client=shared_http_client())
 except (ValueError, KeyError) as e:
     print(f"ERROR in ImageGenerationAgent: {e}")
     client = None
@@ -54,7 +56,10 @@ class ImageGenerationAgent(EnhancedBaseAgent):
         print(f"-- '{self.name}' received prompt. Generating image... --")
 
         try:
-            response = client.images.generate(
+            # The OpenAI client and the download are blocking; run them in threads so
+            # concurrent image generations overlap
+            response = await self._call_llm(
+                client.images.generate,
                 model="dall-e-3",
                 prompt=image_prompt,
                 size="1024x1024",
@@ -65,11 +70,12 @@ class ImageGenerationAgent(EnhancedBaseAgent):
             print(f"-- Image generated successfully. Downloading from URL... --")
 
             # Download and save the image
-            image_data = requests.get(image_url).content
+            image_data = (await asyncio.to_thread(requests.get, image_url)).content
             output_dir = "output/images"
             os.makedirs(output_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_path = os.path.join(output_dir, f"generated_image_{timestamp}.png")
+            # Generations run concurrently, so the timestamp alone can collide
+            file_path = os.path.join(output_dir, f"generated_image_{timestamp}_{uuid.uuid4().hex[:8]}.png")
             
             with open(file_path, 'wb') as f:
                 f.write(image_data)
@@ -4,7 +4,7 @@ from groq import Groq
 import asyncio
 from typing import Dict, Any
 
-from src.agents.core.enhanced_base_agent import EnhancedBaseAgent
+from src.agents.core.enhanced_base_agent import EnhancedBaseAgent, shared_http_client
 
 # Load environment variables
 load_dotenv()
@@ -13,7 +13,7 @@ load_dotenv()
 api_key = os.getenv("GROQ_API_KEY")
 if not api_key:
     raise ValueError("GROQ_API_KEY not found in .env file")
-client = Groq(api_key=api_key)
+client = Groq(api_key=api_key, http_client=shared_http_client())
 
 class SocialMediaAgent(EnhancedBaseAgent):
     """A unified social media agent that coordinates platform-specific content optimization."""
@@ -191,7 +191,8 @@ class MasterAIOrchestrator:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 messages=[{"role": "user", "content": prompt}],
                 model="deepseek-r1-distill-llama-70b",
                 temperature=0.7
@@ -321,7 +322,8 @@ class MasterAIOrchestrator:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 messages=[{"role": "user", "content": prompt}],
                 model="deepseek-r1-distill-llama-70b",
                 temperature=0.8
@@ -425,7 +427,8 @@ class MasterAIOrchestrator:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 messages=[{"role": "user", "content": synthesis_prompt}],
                 model="deepseek-r1-distill-llama-70b",
                 temperature=0.6
@@ -507,7 +510,8 @@ class MasterAIOrchestrator:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 messages=[{"role": "user", "content": prediction_prompt}],
                 model="deepseek-r1-distill-llama-70b",
                 temperature=0.4  # Lower temperature for more consistent predictions
@@ -576,7 +580,8 @@ class MasterAIOrchestrator:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 messages=[{"role": "user", "content": content_prompt}],
                 model="deepseek-r1-distill-llama-70b",
                 temperature=0.8  # Higher temperature for creativity
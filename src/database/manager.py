@@ -1,23 +1,156 @@
 import sqlite3
 import os
 import re
-from datetime import datetime
+import json
+import threading
+from datetime import datetime, timezone
 
 # Define the path for the database in the root of the project
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'marketing_agent.db')
 
-def get_db_connection():
+# Bump whenever init_db gains new DDL so existing databases get migrated
+SCHEMA_VERSION = 2
+
+# Large enough that every statement below stays in the sqlite3 statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Hot statements kept as module constants so the same SQL string is reused on every call
+INSERT_CAMPAIGN_SQL = 'INSERT INTO campaigns (topic, created_at) VALUES (?, ?)'
+INSERT_IDEA_SQL = 'INSERT INTO ideas (campaign_id, idea_text, created_at) VALUES (?, ?, ?)'
+INSERT_DRAFT_SQL = 'INSERT INTO drafts (idea_id, draft_text) VALUES (?, ?)'
+INSERT_SPECIALIZED_DRAFT_SQL = 'INSERT INTO specialized_drafts (original_draft_id, platform, specialized_text) VALUES (?, ?, ?)'
+
+# Strips leading list numbering (e.g. "1. ") from generated ideas
+_LEADING_NUM_RE = re.compile(r'^\d+\.?\s*')
+
+# JSON document for one campaign's full tree (ideas -> drafts -> specialized drafts).
+# Each level aggregates an ordered subquery: ideas oldest first, drafts newest first.
+_CAMPAIGN_JSON = '''
+    json_object(
+        'id', c.id,
+        'topic', c.topic,
+        'created_at', c.created_at,
+        'ideas', (
+            SELECT json_group_array(json(idea)) FROM (
+                SELECT json_object(
+                    'id', i.id,
+                    'idea_text', i.idea_text,
+                    'created_at', i.created_at,
+                    'drafts', (
+                        SELECT json_group_array(json(draft)) FROM (
+                            SELECT json_object(
+                                'id', d.id,
+                                'idea_id', d.idea_id,
+                                'draft_text', d.draft_text,
+                                'created_at', d.created_at,
+                                'specialized_drafts', (
+                                    SELECT json_group_array(json(specialized)) FROM (
+                                        SELECT json_object(
+                                            'id', sd.id,
+                                            'original_draft_id', sd.original_draft_id,
+                                            'platform', sd.platform,
+                                            'specialized_text', sd.specialized_text,
+                                            'created_at', sd.created_at
+                                        ) AS specialized
+                                        FROM specialized_drafts sd
+                                        WHERE sd.original_draft_id = d.id
+                                        ORDER BY sd.created_at DESC
+                                    )
+                                )
+                            ) AS draft
+                            FROM drafts d
+                            WHERE d.idea_id = i.id
+                            ORDER BY d.created_at DESC
+                        )
+                    )
+                ) AS idea
+                FROM ideas i
+                WHERE i.campaign_id = c.id
+                ORDER BY i.id ASC
+            )
+        )
+    )
+'''
+
+# Rebuilds materialized history rows. {where} selects the campaigns to refresh: every
+# campaign (backfill), or the one campaign owning the row a mutator has just written.
+_REFRESH_HISTORY_SQL = f'''
+    INSERT OR REPLACE INTO history_cache (campaign_id, json_blob, version)
+    SELECT c.id, {_CAMPAIGN_JSON}, {SCHEMA_VERSION}
+    FROM campaigns c
+    {{where}}
+'''
+REFRESH_ALL_HISTORY_SQL = _REFRESH_HISTORY_SQL.format(where='')
+REFRESH_CAMPAIGN_HISTORY_SQL = _REFRESH_HISTORY_SQL.format(where='WHERE c.id = ?')
+REFRESH_IDEA_HISTORY_SQL = _REFRESH_HISTORY_SQL.format(
+    where='WHERE c.id = (SELECT campaign_id FROM ideas WHERE id = ?)')
+REFRESH_DRAFT_HISTORY_SQL = _REFRESH_HISTORY_SQL.format(
+    where='WHERE c.id = (SELECT i.campaign_id FROM drafts d JOIN ideas i ON i.id = d.idea_id WHERE d.id = ?)')
+
+# The history read is a scan of the materialized per-campaign documents
+HISTORY_QUERY = 'SELECT json_blob AS campaign FROM history_cache ORDER BY campaign_id DESC'
+
+def _dict_factory(cursor, row):
+    """Returns each row as a plain dict keyed by column name."""
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+def get_db_connection(check_same_thread: bool = True):
     """Creates a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=check_same_thread)
+    conn.row_factory = _dict_factory
+    # Keep dirty pages in the page cache instead of spilling them mid-transaction
+    conn.execute('PRAGMA cache_spill = OFF')
     return conn
 
+# Process-wide connections reused by the data functions below, so each call skips the
+# connect/PRAGMA setup and hits the prepared-statement cache. Writes go through the single
+# read-write connection; get_full_history uses its own read-only connection, so with WAL
+# enabled a history read never waits on (or blocks) an in-flight write.
+_write_conn = None
+_write_lock = threading.Lock()
+_read_conn = None
+_read_lock = threading.Lock()
+
+# In-process cache of the history rows. Every write through this module bumps
+# _history_version, so a cached result is only reused while the data is unchanged.
+_history_version = 0
+_history_cache = None  # (version, list of campaign JSON strings)
+
+def _get_write_connection():
+    """Returns the read-write connection, opening it on first use. Callers must hold _write_lock."""
+    global _write_conn
+    if _write_conn is None:
+        _write_conn = get_db_connection(check_same_thread=False)
+        # WAL lets the read-only connection run alongside writes; the mode persists in the file
+        _write_conn.execute('PRAGMA journal_mode = WAL')
+    return _write_conn
+
+def _get_read_connection():
+    """Returns the read-only connection, opening it on first use. Callers must hold _read_lock."""
+    global _read_conn
+    if _read_conn is None:
+        _read_conn = sqlite3.connect(
+            f'file:{DB_PATH}?mode=ro',
+            uri=True,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        _read_conn.row_factory = _dict_factory
+        _read_conn.execute('PRAGMA query_only = 1')
+    return _read_conn
+
 def init_db():
     """Initializes the database and creates tables if they don't exist."""
-    print("-- Initializing Database --")
     conn = get_db_connection()
     cursor = conn.cursor()
 
+    # Skip the DDL entirely when the schema is already up to date
+    if cursor.execute('PRAGMA user_version').fetchone()['user_version'] == SCHEMA_VERSION:
+        conn.close()
+        return
+
+    print("-- Initializing Database --")
+
     # Campaigns Table: To store the main topics
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS campaigns (
@@ -61,116 +194,105 @@ def init_db():
         )
     ''')
 
+    # History Cache Table: one materialized JSON document per campaign, kept current by the mutators
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS history_cache (
+            campaign_id INTEGER PRIMARY KEY,
+            json_blob TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
+        )
+    ''')
+
+    # Indexes on the foreign keys used to group the history tree.
+    # Composite keys match the ORDER BY clauses so SQLite can skip the sort step.
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ideas_campaign ON ideas(campaign_id, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_drafts_idea ON drafts(idea_id, created_at DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_spec_orig ON specialized_drafts(original_draft_id, created_at DESC)')
+
+    # Backfill history documents for campaigns written before the cache table existed
+    cursor.execute(REFRESH_ALL_HISTORY_SQL)
+
+    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
     conn.commit()
     conn.close()
     print("-- Database Initialized Successfully --")
 
 
-def add_campaign_and_ideas(topic: str, ideas_text: str) -> list:
-    """Adds a new campaign and its ideas, then returns the ideas with their new DB IDs."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+def _bump_history_version():
+    """Invalidates the cached history. Callers must hold _write_lock."""
+    global _history_version
+    _history_version += 1
 
-    # 1. Add the campaign
-    cursor.execute('INSERT INTO campaigns (topic) VALUES (?)', (topic,))
-    campaign_id = cursor.lastrowid
 
-    # 2. Parse and add the ideas
+def add_campaign_and_ideas(topic: str, ideas_text: str) -> list:
+    """Adds a new campaign and its ideas, then returns the ideas with their new DB IDs."""
     # Use regex to remove leading numbers (e.g., "1. ") from each idea
-    ideas = [re.sub(r'^\d+\.?\s*', '', idea.strip()) for idea in ideas_text.split('\n') if idea.strip()]
-    # 2. Parse, add the ideas, and collect them with their new IDs
+    ideas = [_LEADING_NUM_RE.sub('', line) for line in map(str.strip, ideas_text.split('\n')) if line]
     created_ideas = []
-    ideas = [re.sub(r'^\d+\.?\s*', '', idea.strip()) for idea in ideas_text.split('\n') if idea.strip()]
-    for idea_text in ideas:
-        cursor.execute('INSERT INTO ideas (campaign_id, idea_text) VALUES (?, ?)', (campaign_id, idea_text))
-        idea_id = cursor.lastrowid
-        created_ideas.append({'id': idea_id, 'text': idea_text})
-    
-    conn.commit()
-    conn.close()
+    # One timestamp for the whole batch, in the same format as CURRENT_TIMESTAMP
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    with _write_lock:
+        conn = _get_write_connection()
+        with conn:
+            # 1. Add the campaign
+            campaign_id = conn.execute(INSERT_CAMPAIGN_SQL, (topic, now)).lastrowid
+
+            # 2. Add the ideas and collect them with their new IDs
+            for idea_text in ideas:
+                idea_id = conn.execute(INSERT_IDEA_SQL, (campaign_id, idea_text, now)).lastrowid
+                created_ideas.append({'id': idea_id, 'text': idea_text})
+
+            # 3. Materialize the campaign's history document
+            conn.execute(REFRESH_CAMPAIGN_HISTORY_SQL, (campaign_id,))
+        _bump_history_version()
+
     print(f"-- Saved campaign '{topic}' and {len(ideas)} ideas to DB. --")
     return created_ideas
 
 
 def add_draft(idea_id: int, draft_text: str) -> int:
     """Adds a draft for a specific idea using its ID and returns the new draft's ID."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with _write_lock:
+        conn = _get_write_connection()
+        with conn:
+            # Insert the draft using the provided idea_id
+            new_draft_id = conn.execute(INSERT_DRAFT_SQL, (idea_id, draft_text)).lastrowid
+            conn.execute(REFRESH_IDEA_HISTORY_SQL, (idea_id,))
+        _bump_history_version()
 
-    # Insert the draft using the provided idea_id
-    cursor.execute('INSERT INTO drafts (idea_id, draft_text) VALUES (?, ?)', (idea_id, draft_text))
-    new_draft_id = cursor.lastrowid # Get the ID of the newly inserted draft
-    conn.commit()
     print(f"-- Saved draft for idea ID: {idea_id} to DB with draft ID: {new_draft_id}. --")
-    conn.close()
     return new_draft_id
 
 
 def add_specialized_draft(original_draft_id: int, platform: str, specialized_text: str):
     """Adds a specialized draft linked to an original draft."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        'INSERT INTO specialized_drafts (original_draft_id, platform, specialized_text) VALUES (?, ?, ?)',
-        (original_draft_id, platform, specialized_text)
-    )
-    conn.commit()
+    with _write_lock:
+        conn = _get_write_connection()
+        with conn:
+            conn.execute(INSERT_SPECIALIZED_DRAFT_SQL, (original_draft_id, platform, specialized_text))
+            conn.execute(REFRESH_DRAFT_HISTORY_SQL, (original_draft_id,))
+        _bump_history_version()
+
     print(f"-- Saved specialized {platform} draft for original draft ID: {original_draft_id}. --")
-    conn.close()
 
 
 def get_full_history():
     """Retrieves all campaigns with their ideas, drafts, and specialized drafts."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    global _history_cache
 
-    # 1. Fetch all drafts and specialized drafts first for efficiency
-    cursor.execute('SELECT id, idea_id, draft_text, created_at FROM drafts ORDER BY created_at DESC')
-    all_drafts = cursor.fetchall()
-    
-    cursor.execute('SELECT id, original_draft_id, platform, specialized_text, created_at FROM specialized_drafts ORDER BY created_at DESC')
-    all_specialized_drafts = cursor.fetchall()
-
-    # 2. Group specialized drafts by their original draft ID
-    specialized_drafts_by_original_id = {}
-    for sd in all_specialized_drafts:
-        oid = sd['original_draft_id']
-        if oid not in specialized_drafts_by_original_id:
-            specialized_drafts_by_original_id[oid] = []
-        specialized_drafts_by_original_id[oid].append(dict(sd))
-
-    # 3. Group drafts by idea_id and attach their specialized drafts
-    drafts_by_idea_id = {}
-    for draft in all_drafts:
-        draft_dict = dict(draft)
-        draft_dict['specialized_drafts'] = specialized_drafts_by_original_id.get(draft['id'], [])
-        
-        idea_id = draft['idea_id']
-        if idea_id not in drafts_by_idea_id:
-            drafts_by_idea_id[idea_id] = []
-        drafts_by_idea_id[idea_id].append(draft_dict)
-
-    # 4. Fetch all campaigns and build the final history object
-    cursor.execute('SELECT id, topic, created_at FROM campaigns ORDER BY id DESC')
-    campaigns = cursor.fetchall()
-    history = []
-
-    for campaign in campaigns:
-        campaign_dict = dict(campaign)
-        
-        # Fetch ideas for the current campaign
-        cursor.execute('SELECT id, idea_text, created_at FROM ideas WHERE campaign_id = ? ORDER BY id ASC', (campaign['id'],))
-        ideas = cursor.fetchall()
-        
-        # Attach the pre-fetched drafts to each idea
-        ideas_list = []
-        for idea in ideas:
-            idea_dict = dict(idea)
-            idea_dict['drafts'] = drafts_by_idea_id.get(idea['id'], [])
-            ideas_list.append(idea_dict)
-            
-        campaign_dict['ideas'] = ideas_list
-        history.append(campaign_dict)
+    # Each campaign's tree is materialized in history_cache on write, so reading the
+    # history is a single scan of those documents, newest campaign first.
+    with _read_lock:
+        # Read the version before querying: a write landing mid-read only makes the
+        # cached rows newer than their tag, which the next call simply refetches.
+        version = _history_version
+        if _history_cache is None or _history_cache[0] != version:
+            cursor = _get_read_connection().execute(HISTORY_QUERY)
+            _history_cache = (version, [row['campaign'] for row in cursor])
+        campaigns = _history_cache[1]
 
-    conn.close()
-    return history
+    # Decoding the cached JSON on every call hands each caller its own copy to mutate
+    return [json.loads(campaign) for campaign in campaigns]
@@ -10,26 +10,231 @@ This replaces traditional forms with intelligent, context-aware dialogue.
 
 import gradio as gr
 import asyncio
+import concurrent.futures
+import functools
+import hashlib
+import html
 import json
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+import re
+import shelve
+import threading
+import time
+import uuid
+from typing import Dict, List, Any, Optional, Tuple, Iterator, AsyncIterator, Final
 import os
 
 from src.core.master_orchestrator import MasterAIOrchestrator, AgentRole
 
+# Campaign data extraction patterns, compiled once instead of on every message.
+# The keyword patterns keep the original substring semantics ("products" matches "product").
+_BUDGET_RE = re.compile(r'[\$€]([0-9,]+)')
+_BUDGET_HINTS_RE = re.compile(r'[\$€]|budget|spend')
+_TOPIC_KEYWORDS_RE = re.compile(r'selling|product|service|business|company|brand')
+_AUDIENCE_KEYWORDS_RE = re.compile(r'gen z|millennials|teens|adults|age|target')
+_TOPIC_MARKERS = frozenset({"selling", "for", "about", "promoting"})
+
+# Compact message history encoding: type codes and the agent index order
+MESSAGE_USER = 0
+MESSAGE_AGENT = 1
+AGENT_ORDER = ("ceo", "cmo", "creative_director", "performance_manager")
+_AGENT_INDEX = {agent: index for index, agent in enumerate(AGENT_ORDER)}
+# Unknown agents are stored under the index just past AGENT_ORDER and render as _DEFAULT_AGENT
+DEFAULT_AGENT_INDEX = len(AGENT_ORDER)
+_DEFAULT_AGENT: Final = {"name": "AI Agent", "avatar": "🤖", "title": "AI Assistant"}
+
+# Sidebar panel that displays each state field, for dirty tracking between renders
+PANEL_FOR_STATE_KEY = {"phase": "progress", "active_agents": "agents", "current_strategy": "strategy"}
+
+# Campaign phases shown in the progress panel: (icon, title, percent complete)
+PROGRESS_PHASES = {
+    "initial": ("🏁", "Getting Started", 0),
+    "briefing": ("📝", "Gathering Requirements", 25),
+    "strategy": ("🎯", "Creating Strategy", 50),
+    "content": ("✍️", "Generating Content", 75),
+    "execution": ("🚀", "Ready to Launch", 100)
+}
+
+# Specialist replies when the strategy is accepted and content creation starts
+STRATEGY_PHASE_REPLIES = {
+    "creative_director": "🎨 Perfect! I'm excited about this strategy. Let me start creating some content variations for you.",
+    "performance_manager": "📊 I'll also run some performance predictions so we know what to expect.\n\n✍️ Ready to see your content options!"
+}
+
+# Minimum seconds between streamed chat re-renders (~20 updates per second)
+RENDER_INTERVAL = 0.05
+
+# Static page content, built once at import instead of on every render
+_CSS: Final[str] = """
+    .chat-container {
+        max-height: 600px;
+        overflow-y: auto;
+        padding: 20px;
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        border-radius: 15px;
+        margin: 10px 0;
+    }
+    
+    .agent-message {
+        background: rgba(255, 255, 255, 0.95);
+        padding: 15px 20px;
+        margin: 10px 0;
+        border-radius: 18px;
+        border-left: 4px solid #667eea;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    }
+    
+    .user-message {
+        background: #667eea;
+        color: white;
+        padding: 15px 20px;
+        margin: 10px 0;
+        border-radius: 18px;
+        text-align: right;
+        margin-left: 50px;
+    }
+    
+    .agent-header {
+        display: flex;
+        align-items: center;
+        margin-bottom: 10px;
+        font-weight: bold;
+        color: #333;
+    }
+    
+    .agent-avatar {
+        font-size: 24px;
+        margin-right: 10px;
+    }
+    
+    .strategy-card {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        padding: 20px;
+        border-radius: 15px;
+        color: white;
+        margin: 15px 0;
+    }
+    
+    .metrics-card {
+        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        padding: 15px;
+        border-radius: 12px;
+        margin: 10px 0;
+        color: white;
+    }
+    
+    .action-button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        border: none;
+        padding: 12px 25px;
+        border-radius: 25px;
+        color: white;
+        font-weight: bold;
+        cursor: pointer;
+        transition: all 0.3s ease;
+    }
+    
+    .action-button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
+    }
+    
+    .typing-indicator {
+        background: rgba(255, 255, 255, 0.9);
+        padding: 10px 20px;
+        border-radius: 18px;
+        margin: 10px 0;
+        font-style: italic;
+        color: #666;
+    }
+    """
+
+_WELCOME_HTML: Final[str] = """
+    <div class="chat-container">
+        <div class="agent-message">
+            <div class="agent-header">
+                <span class="agent-avatar">🤖</span>
+                <div>
+                    <div>AI Marketing Team</div>
+                    <small>Welcome to the future of marketing</small>
+                </div>
+            </div>
+            <p>Welcome to the most advanced AI Marketing system ever created! 🚀</p>
+            <p>I'm here with a team of AI marketing experts ready to help you create incredible campaigns:</p>
+            <ul>
+                <li>👩‍💼 <strong>Alexandra</strong> - AI Marketing CEO (Strategy & Vision)</li>
+                <li>🎯 <strong>Marcus</strong> - AI Marketing Director (Trends & Psychology)</li>
+                <li>🎨 <strong>Sofia</strong> - AI Creative Director (Design & Visuals)</li>
+                <li>📊 <strong>David</strong> - AI Performance Manager (Analytics & Optimization)</li>
+            </ul>
+            <p>Click <strong>"🚀 Start New Campaign"</strong> to begin our conversation, or just type what you'd like to create!</p>
+        </div>
+    </div>
+    """
+
+_EMPTY_STRATEGY_HTML: Final[str] = """
+        <div class="strategy-card">
+            <h3>🎯 Campaign Strategy</h3>
+            <p>Strategy will be created through our conversation. Start by telling us about your campaign goals!</p>
+        </div>
+        """
+
+# On-disk cache of strategy meeting results, shared across runs
+MEETING_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "marketinglast", "meetings.db")
+
+class _MeetingCache:
+    """
+    Persistent cache of strategy meeting results keyed by campaign data hash
+    """
+    
+    def __init__(self, path: str = MEETING_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached meeting result, or None on a miss"""
+        try:
+            with self._lock, shelve.open(self.path) as cache:
+                return cache.get(key)
+        except Exception as e:
+            print(f"⚠️ Meeting cache read failed: {e}")
+            return None
+    
+    def set(self, key: str, value: Dict):
+        """Store a meeting result"""
+        try:
+            with self._lock, shelve.open(self.path) as cache:
+                cache[key] = value
+        except Exception as e:
+            print(f"⚠️ Meeting cache write failed: {e}")
+
+@functools.lru_cache(maxsize=1)
+def _get_orchestrator() -> MasterAIOrchestrator:
+    """Process-wide orchestrator, shared by every interface instance"""
+    return MasterAIOrchestrator()
+
 class ConversationalInterface:
     """
     Revolutionary UI that enables natural conversations with AI marketing agents
     """
     
+    # Rendered progress panels, keyed by phase
+    _progress_cache: Dict[str, str] = {}
+    
     def __init__(self):
-        self.orchestrator = MasterAIOrchestrator()
+        self.orchestrator = _get_orchestrator()
         self.conversation_state = {
             "phase": "initial",  # initial, briefing, strategy, content, execution
             "campaign_data": {},
-            "conversation_history": [],
+            # Message history as parallel arrays, one entry per message (see _append_message)
+            "hist_types": [],
+            "hist_agents": [],
+            "hist_contents": [],
+            "hist_timestamps": [],
             "active_agents": [],
-            "current_strategy": None
+            "current_strategy": None,
+            # Sidebar panels whose inputs changed since they were last rendered
+            "_dirty": dict.fromkeys(PANEL_FOR_STATE_KEY.values(), False)
         }
         
         # Agent avatars and descriptions
@@ -60,97 +265,49 @@ class ConversationalInterface:
             }
         }
         
-        print("🎨 Conversational Interface initialized with AI agents")
-    
-    def create_interface(self) -> gr.Blocks:
-        """Create the revolutionary conversational interface"""
-        
-        # Custom CSS for modern, chat-like interface
-        css = """
-        .chat-container {
-            max-height: 600px;
-            overflow-y: auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border-radius: 15px;
-            margin: 10px 0;
-        }
-        
-        .agent-message {
-            background: rgba(255, 255, 255, 0.95);
-            padding: 15px 20px;
-            margin: 10px 0;
-            border-radius: 18px;
-            border-left: 4px solid #667eea;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
+        # Agent info by history index, with the fallback agent at DEFAULT_AGENT_INDEX
+        self._agent_info_indexed = tuple(self.agent_info[agent] for agent in AGENT_ORDER) + (_DEFAULT_AGENT,)
         
-        .user-message {
-            background: #667eea;
-            color: white;
-            padding: 15px 20px;
-            margin: 10px 0;
-            border-radius: 18px;
-            text-align: right;
-            margin-left: 50px;
+        # Conversation handler for each phase
+        self._phase_handlers = {
+            "initial": self._handle_briefing_phase,    # CEO handles initial briefing
+            "briefing": self._handle_briefing_phase,
+            "strategy": self._handle_strategy_phase,   # Full team strategic meeting
+            "content": self._handle_content_phase      # Content creation phase
         }
         
-        .agent-header {
-            display: flex;
-            align-items: center;
-            margin-bottom: 10px;
-            font-weight: bold;
-            color: #333;
+        # Agent cards only differ by their status line, so both variants are pre-rendered
+        self._agents_header = "<div style='padding: 15px;'><h3>🤖 AI Team Status</h3>"
+        self._agent_card_active = {
+            agent_key: self._render_agent_card(info, "🟢 Active") for agent_key, info in self.agent_info.items()
         }
-        
-        .agent-avatar {
-            font-size: 24px;
-            margin-right: 10px;
+        self._agent_card_standby = {
+            agent_key: self._render_agent_card(info, "⚪ Standby") for agent_key, info in self.agent_info.items()
         }
         
-        .strategy-card {
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            padding: 20px;
-            border-radius: 15px;
-            color: white;
-            margin: 15px 0;
-        }
+        # Meeting results are fully determined by the campaign data, so repeats come from disk
+        self._meeting_cache = _MeetingCache()
         
-        .metrics-card {
-            background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            padding: 15px;
-            border-radius: 12px;
-            margin: 10px 0;
-            color: white;
-        }
+        # Strategy meetings started ahead of time, as (meeting key, task) per session id
+        self._pending_meetings: Dict[str, Tuple[str, asyncio.Task]] = {}
+        # Meetings taken out of _pending_meetings but still running; kept referenced until
+        # they finish and cache their results
+        self._detached_meetings: set = set()
+        self._agents_standby_html = self._agents_header + "".join(self._agent_card_standby.values()) + "</div>"
         
-        .action-button {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border: none;
-            padding: 12px 25px;
-            border-radius: 25px;
-            color: white;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
+        # Long-lived event loop for all async agent work. Running every turn on the same
+        # loop keeps the orchestrator's HTTP sessions and caches alive between messages.
+        self._loop = asyncio.new_event_loop()
+        self._loop_lock = threading.Lock()
+        self._loop_thread = self._start_loop_thread()
         
-        .action-button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-        }
+        print("🎨 Conversational Interface initialized with AI agents")
+    
+    def create_interface(self) -> gr.Blocks:
+        """Create the revolutionary conversational interface"""
         
-        .typing-indicator {
-            background: rgba(255, 255, 255, 0.9);
-            padding: 10px 20px;
-            border-radius: 18px;
-            margin: 10px 0;
-            font-style: italic;
-            color: #666;
-        }
-        """
         
-        with gr.Blocks(css=css, theme=gr.themes.Soft(), title="🤖 AI Marketing Conversation Studio") as interface:
+        with gr.Blocks(css=_CSS, theme=gr.themes.Soft(), title="🤖 AI Marketing Conversation Studio") as interface:
             
             # Header
             gr.HTML("""
@@ -220,52 +377,68 @@ class ConversationalInterface:
             
             # Event handlers
             
-            def handle_user_message(message: str, state: Dict) -> Tuple[str, Dict, str, str, str, str]:
-                """Handle user message and generate AI responses"""
+            def render_outputs(state: Dict) -> Tuple[str, Dict, str, Any, Any, Any]:
+                """Render the outputs of a message turn, leaving unchanged sidebar panels untouched"""
+                dirty = state.setdefault("_dirty", dict.fromkeys(PANEL_FOR_STATE_KEY.values(), False))
+                outputs = (
+                    self._render_conversation(state),
+                    state,
+                    "",  # Clear input
+                    self._render_agents_status(state.get("active_agents", [])) if dirty["agents"] else gr.update(),
+                    self._render_progress(state) if dirty["progress"] else gr.update(),
+                    self._render_strategy(state.get("current_strategy")) if dirty["strategy"] else gr.update()
+                )
+                dirty.update(dict.fromkeys(dirty, False))
+                return outputs
+            
+            def handle_user_message(message: str, state: Dict) -> Iterator[Tuple[str, Dict, str, Any, Any, Any]]:
+                """Handle user message and stream AI responses as each agent speaks"""
                 if not message.strip():
-                    return (
-                        self._render_conversation(state),
-                        state,
-                        "",
-                        self._render_agents_status(state.get("active_agents", [])),
-                        self._render_progress(state),
-                        self._render_strategy(state.get("current_strategy"))
-                    )
+                    # Nothing happened, so every panel is left as it is
+                    yield gr.update(), state, "", gr.update(), gr.update(), gr.update()
+                    return
                 
                 # Add user message to conversation
-                state["conversation_history"].append({
-                    "type": "user",
-                    "content": message,
-                    "timestamp": datetime.now().isoformat()
-                })
+                self._append_message(state, message)
                 
-                # Process message and generate AI response
-                ai_response, updated_state = asyncio.run(
-                    self._process_user_message(message, state)
-                )
+                # Show the user's message right away, then each agent reply as it arrives.
+                # Updates closer together than RENDER_INTERVAL are coalesced, but a held-back
+                # update is rendered as soon as the next one is slow to arrive.
+                yield render_outputs(state)
+                last_render = time.monotonic()
+                pending_state = None
                 
-                return (
-                    self._render_conversation(updated_state),
-                    updated_state,
-                    "",  # Clear input
-                    self._render_agents_status(updated_state.get("active_agents", [])),
-                    self._render_progress(updated_state),
-                    self._render_strategy(updated_state.get("current_strategy"))
-                )
+                updates = self._process_user_message(message, state)
+                for updated_state in self._stream_on_loop(updates, idle_timeout=RENDER_INTERVAL):
+                    if updated_state is None:
+                        if pending_state is not None:
+                            # The handler is still updating the state on the loop thread, so
+                            # render there, between its steps
+                            yield self._run_on_loop(render_outputs, pending_state)
+                            last_render = time.monotonic()
+                            pending_state = None
+                        continue
+                    if time.monotonic() - last_render < RENDER_INTERVAL:
+                        pending_state = updated_state
+                        continue
+                    pending_state = None
+                    yield render_outputs(updated_state)
+                    last_render = time.monotonic()
+                
+                if pending_state is not None:
+                    yield render_outputs(pending_state)
             
             def start_new_campaign(state: Dict) -> Tuple[str, Dict, str, str, str]:
                 """Start a new campaign conversation"""
                 state["phase"] = "briefing"
                 state["active_agents"] = ["ceo"]
                 
-                welcome_message = {
-                    "type": "agent",
-                    "agent": "ceo",
-                    "content": "👩‍💼 Hello! I'm Alexandra, your AI Marketing CEO. I'm excited to help you create an amazing campaign! Tell me, what's your vision for this new marketing campaign? What product, service, or message do you want to promote?",
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                state["conversation_history"] = [welcome_message]
+                self._reset_history(state)
+                self._append_message(
+                    state,
+                    "👩‍💼 Hello! I'm Alexandra, your AI Marketing CEO. I'm excited to help you create an amazing campaign! Tell me, what's your vision for this new marketing campaign? What product, service, or message do you want to promote?",
+                    agent="ceo"
+                )
                 
                 return (
                     self._render_conversation(state),
@@ -279,23 +452,19 @@ class ConversationalInterface:
                 """Trigger trend analysis"""
                 if not state.get("campaign_data", {}).get("topic"):
                     # Add agent message requesting topic first
-                    message = {
-                        "type": "agent",
-                        "agent": "cmo",
-                        "content": "🎯 Hi! I'm Marcus, your AI Marketing Director. To analyze trends effectively, I need to know what topic or industry you're focusing on. Could you tell me more about your campaign focus?",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    state["conversation_history"].append(message)
+                    self._append_message(
+                        state,
+                        "🎯 Hi! I'm Marcus, your AI Marketing Director. To analyze trends effectively, I need to know what topic or industry you're focusing on. Could you tell me more about your campaign focus?",
+                        agent="cmo"
+                    )
                     state["active_agents"] = ["cmo"]
                 else:
                     # Perform trend analysis
-                    message = {
-                        "type": "agent", 
-                        "agent": "cmo",
-                        "content": f"🎯 Analyzing current trends for {state['campaign_data']['topic']}... This is fascinating! I'm seeing some incredible opportunities in this space. Let me share what I've discovered...",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    state["conversation_history"].append(message)
+                    self._append_message(
+                        state,
+                        f"🎯 Analyzing current trends for {state['campaign_data']['topic']}... This is fascinating! I'm seeing some incredible opportunities in this space. Let me share what I've discovered...",
+                        agent="cmo"
+                    )
                 
                 return (
                     self._render_conversation(state),
@@ -309,13 +478,15 @@ class ConversationalInterface:
             send_button.click(
                 fn=handle_user_message,
                 inputs=[user_input, conversation_state],
-                outputs=[chat_display, conversation_state, user_input, active_agents_display, progress_display, strategy_display]
+                outputs=[chat_display, conversation_state, user_input, active_agents_display, progress_display, strategy_display],
+                queue=True
             )
             
             user_input.submit(
                 fn=handle_user_message,
                 inputs=[user_input, conversation_state],
-                outputs=[chat_display, conversation_state, user_input, active_agents_display, progress_display, strategy_display]
+                outputs=[chat_display, conversation_state, user_input, active_agents_display, progress_display, strategy_display],
+                queue=True
             )
             
             start_campaign_btn.click(
@@ -334,48 +505,72 @@ class ConversationalInterface:
     
     def _render_welcome_message(self) -> str:
         """Render the initial welcome message"""
-        return """
-        <div class="chat-container">
-            <div class="agent-message">
-                <div class="agent-header">
-                    <span class="agent-avatar">🤖</span>
-                    <div>
-                        <div>AI Marketing Team</div>
-                        <small>Welcome to the future of marketing</small>
-                    </div>
-                </div>
-                <p>Welcome to the most advanced AI Marketing system ever created! 🚀</p>
-                <p>I'm here with a team of AI marketing experts ready to help you create incredible campaigns:</p>
-                <ul>
-                    <li>👩‍💼 <strong>Alexandra</strong> - AI Marketing CEO (Strategy & Vision)</li>
-                    <li>🎯 <strong>Marcus</strong> - AI Marketing Director (Trends & Psychology)</li>
-                    <li>🎨 <strong>Sofia</strong> - AI Creative Director (Design & Visuals)</li>
-                    <li>📊 <strong>David</strong> - AI Performance Manager (Analytics & Optimization)</li>
-                </ul>
-                <p>Click <strong>"🚀 Start New Campaign"</strong> to begin our conversation, or just type what you'd like to create!</p>
-            </div>
-        </div>
-        """
+        return _WELCOME_HTML
+    
+    def _set_panel_data(self, state: Dict, key: str, value: Any):
+        """Set a state field shown in a sidebar panel, marking the panel dirty only if it changed"""
+        if state.get(key) != value:
+            state[key] = value
+            state.setdefault("_dirty", dict.fromkeys(PANEL_FOR_STATE_KEY.values(), False))[PANEL_FOR_STATE_KEY[key]] = True
+    
+    def _append_message(self, state: Dict, content: str, agent: Optional[str] = None):
+        """Append a message to the history arrays; agent=None marks a user message"""
+        state["hist_types"].append(MESSAGE_USER if agent is None else MESSAGE_AGENT)
+        state["hist_agents"].append(-1 if agent is None else _AGENT_INDEX.get(agent, DEFAULT_AGENT_INDEX))
+        state["hist_contents"].append(content)
+        state["hist_timestamps"].append(self._ts())
+    
+    def _extend_messages(self, state: Dict, messages: List[Tuple[str, str]]):
+        """Append several (agent, content) agent messages at once, sharing one timestamp"""
+        timestamp = self._ts()
+        state["hist_types"].extend([MESSAGE_AGENT] * len(messages))
+        state["hist_agents"].extend(_AGENT_INDEX.get(agent, DEFAULT_AGENT_INDEX) for agent, _ in messages)
+        state["hist_contents"].extend(content for _, content in messages)
+        state["hist_timestamps"].extend([timestamp] * len(messages))
+    
+    def _reset_history(self, state: Dict):
+        """Clear the message history and its rendered prefix"""
+        for key in ("hist_types", "hist_agents", "hist_contents", "hist_timestamps"):
+            state[key] = []
+        state.pop("_prefix_cache", None)
     
     def _render_conversation(self, state: Dict) -> str:
         """Render the conversation history"""
-        html = '<div class="chat-container">'
+        count = len(state.get("hist_types", []))
+        if not count:
+            return '<div class="chat-container"></div>'
+        
+        # Only the latest message is rendered fresh; everything before it comes from the cached prefix
+        return self._render_static_prefix(state) + self._render_message(state, count - 1) + '</div>'
+    
+    def _render_static_prefix(self, state: Dict) -> str:
+        """Render the container opening and every message except the latest, memoized in the state"""
+        count = len(state["hist_types"]) - 1
+        
+        # History only grows between resets, so the cached prefix is extended with the
+        # messages added since it was built; each message is rendered once
+        cached_count, prefix = state.get("_prefix_cache", (0, '<div class="chat-container">'))
+        if cached_count < count:
+            parts = [prefix]
+            parts.extend(self._render_message(state, index) for index in range(cached_count, count))
+            prefix = "".join(parts)
+            state["_prefix_cache"] = (count, prefix)
+        return prefix
+    
+    def _render_message(self, state: Dict, index: int) -> str:
+        """Render one message of the history with its content HTML-escaped"""
+        content = html.escape(state["hist_contents"][index]).replace("\n", "<br>")
         
-        for message in state.get("conversation_history", []):
-            if message["type"] == "user":
-                html += f"""
+        if state["hist_types"][index] == MESSAGE_USER:
+            return f"""
                 <div class="user-message">
-                    <strong>You:</strong> {message["content"]}
+                    <strong>You:</strong> {content}
                 </div>
                 """
-            elif message["type"] == "agent":
-                agent_info = self.agent_info.get(message["agent"], {
-                    "name": "AI Agent",
-                    "avatar": "🤖",
-                    "title": "AI Assistant"
-                })
-                
-                html += f"""
+        
+        agent_info = self._agent_info_indexed[state["hist_agents"][index]]
+        
+        return f"""
                 <div class="agent-message">
                     <div class="agent-header">
                         <span class="agent-avatar">{agent_info["avatar"]}</span>
@@ -384,47 +579,40 @@ class ConversationalInterface:
                             <small>{agent_info["title"]}</small>
                         </div>
                     </div>
-                    <p>{message["content"]}</p>
+                    <p>{content}</p>
                 </div>
                 """
-        
-        html += '</div>'
-        return html
     
     def _render_agents_status(self, active_agents: List[str] = []) -> str:
         """Render active agents status"""
-        html = "<div style='padding: 15px;'>"
-        html += "<h3>🤖 AI Team Status</h3>"
-        
-        for agent_key, info in self.agent_info.items():
-            status = "🟢 Active" if agent_key in active_agents else "⚪ Standby"
-            html += f"""
+        if not active_agents:
+            return self._agents_standby_html
+        return self._agents_header + "".join(
+            self._agent_card_active[agent_key] if agent_key in active_agents else self._agent_card_standby[agent_key]
+            for agent_key in self.agent_info
+        ) + "</div>"
+    
+    def _render_agent_card(self, info: Dict[str, str], status: str) -> str:
+        """Render one agent's status card"""
+        return f"""
             <div style='margin: 10px 0; padding: 10px; background: rgba(102, 126, 234, 0.1); border-radius: 8px;'>
                 <div><span style='font-size: 18px;'>{info['avatar']}</span> <strong>{info['name']}</strong></div>
                 <div style='font-size: 12px; color: #666;'>{info['title']}</div>
                 <div style='font-size: 12px; margin-top: 5px;'>{status}</div>
             </div>
             """
-        
-        html += "</div>"
-        return html
     
-    def _render_progress(self, state: Dict) -> str:
+    def _render_progress(self, state: Optional[Dict] = None) -> str:
         """Render campaign progress"""
-        phase = state.get("phase", "initial")
-        
-        phases = {
-            "initial": ("🏁", "Getting Started", 0),
-            "briefing": ("📝", "Gathering Requirements", 25),
-            "strategy": ("🎯", "Creating Strategy", 50),
-            "content": ("✍️", "Generating Content", 75),
-            "execution": ("🚀", "Ready to Launch", 100)
-        }
-        
-        current_phase = phases.get(phase, phases["initial"])
-        icon, title, progress = current_phase
-        
-        return f"""
+        phase = (state or {}).get("phase", "initial")
+        if phase not in PROGRESS_PHASES:
+            phase = "initial"
+        
+        # Only five distinct panels exist, so each is rendered once and reused
+        panel = self._progress_cache.get(phase)
+        if panel is None:
+            icon, title, progress = PROGRESS_PHASES[phase]
+            panel = self._progress_cache[phase] = f"""
         <div style='padding: 15px;'>
             <h3>📊 Campaign Progress</h3>
             <div style='margin: 15px 0;'>
@@ -437,16 +625,12 @@ class ConversationalInterface:
             </div>
         </div>
         """
+        return panel
     
     def _render_strategy(self, strategy: Optional[Dict] = None) -> str:
         """Render current strategy"""
         if not strategy:
-            return """
-            <div class="strategy-card">
-                <h3>🎯 Campaign Strategy</h3>
-                <p>Strategy will be created through our conversation. Start by telling us about your campaign goals!</p>
-            </div>
-            """
+            return _EMPTY_STRATEGY_HTML
         
         strategy_data = strategy.get("strategy", {})
         
@@ -459,27 +643,70 @@ class ConversationalInterface:
         </div>
         """
     
-    async def _process_user_message(self, message: str, state: Dict) -> Tuple[str, Dict]:
-        """Process user message and generate appropriate AI response"""
+    def _start_loop_thread(self) -> threading.Thread:
+        """Run the persistent event loop on a daemon thread"""
+        thread = threading.Thread(target=self._loop.run_forever, name="conversation-loop", daemon=True)
+        thread.start()
+        return thread
+    
+    def _submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the persistent event loop for a synchronous caller to wait on"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # Blocking here would stall the caller's loop, or deadlock if it is the persistent one
+            coro.close()
+            raise RuntimeError("Synchronous wrappers can't be used from a running event loop; await the coroutine instead")
+        
+        with self._loop_lock:
+            if not self._loop_thread.is_alive():
+                # The loop thread died; restarting it on the same loop keeps loop-bound work usable
+                if self._loop.is_closed():
+                    self._loop = asyncio.new_event_loop()
+                self._loop_thread = self._start_loop_thread()
+            return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def _run_on_loop(self, func, *args):
+        """Call a function on the persistent event loop thread and return its result"""
+        async def call():
+            return func(*args)
+        return self._submit(call()).result()
+    
+    def _stream_on_loop(self, updates: AsyncIterator[Dict], idle_timeout: Optional[float] = None) -> Iterator[Optional[Dict]]:
+        """Drive an async generator on the persistent event loop, yielding each item synchronously
+        
+        With an idle_timeout, None is yielded once whenever the next item takes longer than that.
+        """
+        while True:
+            future = self._submit(updates.__anext__())
+            try:
+                if idle_timeout is not None:
+                    try:
+                        yield future.result(timeout=idle_timeout)
+                        continue
+                    except concurrent.futures.TimeoutError:
+                        yield None
+                yield future.result()
+            except StopAsyncIteration:
+                return
+    
+    def _ts(self) -> float:
+        """Timestamp for a new message, stored raw as epoch seconds"""
+        return time.time()
+    
+    async def _process_user_message(self, message: str, state: Dict) -> AsyncIterator[Dict]:
+        """Process user message, yielding the state each time an AI response is added"""
         
         # Extract campaign information from message
         self._extract_campaign_data(message, state)
         
-        # Determine conversation phase and active agents
-        phase = state.get("phase", "initial")
-        
-        if phase == "initial" or phase == "briefing":
-            # CEO handles initial briefing
-            return await self._handle_briefing_phase(message, state)
-        elif phase == "strategy":
-            # Full team strategic meeting
-            return await self._handle_strategy_phase(message, state)
-        elif phase == "content":
-            # Content creation phase
-            return await self._handle_content_phase(message, state)
-        else:
-            # Default response
-            return await self._handle_general_conversation(message, state)
+        # Determine conversation phase and active agents; unknown phases get the default response
+        handler = self._phase_handlers.get(state.get("phase", "initial"), self._handle_general_conversation)
+        
+        async for updated_state in handler(message, state):
+            yield updated_state
     
     def _extract_campaign_data(self, message: str, state: Dict):
         """Extract campaign information from user message"""
@@ -491,43 +718,125 @@ class ConversationalInterface:
         # Extract topic/product
         if not campaign_data.get("topic"):
             # Look for business/product indicators
-            if any(word in message_lower for word in ["selling", "product", "service", "business", "company", "brand"]):
+            if _TOPIC_KEYWORDS_RE.search(message_lower):
                 # Extract the main subject
                 words = message.split()
                 for i, word in enumerate(words):
-                    if word.lower() in ["selling", "for", "about", "promoting"]:
+                    if word.lower() in _TOPIC_MARKERS:
                         if i + 1 < len(words):
                             topic = " ".join(words[i+1:i+4])  # Take next 3 words
                             campaign_data["topic"] = topic
                             break
         
         # Extract target audience
-        if any(word in message_lower for word in ["gen z", "millennials", "teens", "adults", "age", "target"]):
+        if _AUDIENCE_KEYWORDS_RE.search(message_lower):
             if "gen z" in message_lower:
                 campaign_data["target_audience"] = "Gen Z (18-25 years old)"
             elif "millennial" in message_lower:
                 campaign_data["target_audience"] = "Millennials (26-40 years old)"
         
         # Extract budget hints
-        if any(char in message for char in ["$", "€", "budget", "spend"]):
+        if _BUDGET_HINTS_RE.search(message):
             # Extract budget (simplified)
-            import re
-            budget_match = re.search(r'[\$€]([0-9,]+)', message)
+            budget_match = _BUDGET_RE.search(message)
             if budget_match:
                 campaign_data["budget"] = budget_match.group(0)
         
         state["campaign_data"] = campaign_data
+        
+        # Topic and audience are usually final by now, so start the strategy meeting
+        # in the background while the briefing conversation continues
+        briefing = state.get("phase", "initial") in ("initial", "briefing")
+        if briefing and campaign_data.get("topic") and campaign_data.get("target_audience"):
+            self._start_speculative_meeting(state)
+    
+    def _meeting_key(self, campaign_data: Dict) -> str:
+        """Stable key identifying the strategy meeting for a set of campaign data"""
+        return hashlib.sha1(json.dumps(campaign_data, sort_keys=True).encode()).hexdigest()
+    
+    def _session_id(self, state: Dict) -> str:
+        """Id of the browser session a conversation state belongs to"""
+        return state.setdefault("_session_id", uuid.uuid4().hex)
+    
+    def _start_speculative_meeting(self, state: Dict):
+        """Launch the strategy meeting for the current campaign data as a background task"""
+        session_id = self._session_id(state)
+        key = self._meeting_key(state["campaign_data"])
+        previous = self._pending_meetings.get(session_id)
+        if previous and previous[0] == key:
+            return
+        
+        # The campaign data changed since the last launch. Its worker thread can't be stopped,
+        # so let that meeting finish and cache its result under its own key.
+        if previous:
+            del self._pending_meetings[session_id]
+            self._detached_meetings.add(previous[1])
+        if self._meeting_cache.get(key) is not None:
+            return
+        
+        # The meeting runs on its own loop in a worker thread so it never competes with
+        # this session's turns.
+        task = asyncio.create_task(asyncio.to_thread(
+            asyncio.run, self.orchestrator.simulate_strategic_meeting(dict(state["campaign_data"]))
+        ))
+        task.add_done_callback(functools.partial(self._finish_speculative_meeting, session_id, key))
+        self._pending_meetings[session_id] = (key, task)
+    
+    def _finish_speculative_meeting(self, session_id: str, key: str, task: asyncio.Task):
+        """Cache a finished background meeting and drop it, even if its session never asks for it"""
+        if self._pending_meetings.get(session_id, (None, None))[1] is task:
+            del self._pending_meetings[session_id]
+        self._detached_meetings.discard(task)
+        if not task.cancelled() and task.exception() is None:
+            self._cache_meeting(key, task.result())
+    
+    async def _run_strategic_meeting(self, state: Dict, campaign_data: Dict) -> Dict:
+        """Return the meeting result from the cache, the background meeting, or a fresh meeting"""
+        key = self._meeting_key(campaign_data)
+        pending = self._take_pending_meeting(state)
+        
+        meeting_result = self._meeting_cache.get(key)
+        if meeting_result is not None:
+            return meeting_result
+        
+        # A background meeting caches its own result when it finishes, even if this turn is cancelled
+        if pending:
+            return await asyncio.shield(pending)
+        meeting_result = await self.orchestrator.simulate_strategic_meeting(campaign_data)
+        self._cache_meeting(key, meeting_result)
+        return meeting_result
+    
+    def _cache_meeting(self, key: str, meeting_result: Dict):
+        """Store a meeting result unless any part of it fell back to an error response"""
+        if meeting_result.get("final_strategy", {}).get("status") != "success":
+            return
+        analyses = meeting_result.get("individual_analyses", {}).values()
+        if any("error" in analysis.get("analysis", {}) for analysis in analyses):
+            return
+        self._meeting_cache.set(key, meeting_result)
+    
+    def _take_pending_meeting(self, state: Dict) -> Optional[asyncio.Task]:
+        """Return the background meeting if it matches the current campaign data, else None"""
+        pending = self._pending_meetings.pop(self._session_id(state), None)
+        if pending is None:
+            return None
+        
+        key, task = pending
+        self._detached_meetings.add(task)
+        if key != self._meeting_key(state.get("campaign_data", {})):
+            return None
+        return task
     
-    async def _handle_briefing_phase(self, message: str, state: Dict) -> Tuple[str, Dict]:
+    async def _handle_briefing_phase(self, message: str, state: Dict) -> AsyncIterator[Dict]:
         """Handle the initial briefing conversation"""
-        state["active_agents"] = ["ceo"]
+        self._set_panel_data(state, "active_agents", ["ceo"])
         
         campaign_data = state.get("campaign_data", {})
         
         # Check if we have enough information for strategy
-        if campaign_data.get("topic") and len(state["conversation_history"]) >= 3:
+        if campaign_data.get("topic") and len(state["hist_types"]) >= 3:
             # Ready to move to strategy phase
-            state["phase"] = "strategy"
+            self._set_panel_data(state, "phase", "strategy")
             
             # CEO introduces the team
             response = f"""
@@ -541,37 +850,23 @@ class ConversationalInterface:
             """
             
             # Add typing indicator
-            state["conversation_history"].append({
-                "type": "agent",
-                "agent": "ceo", 
-                "content": response,
-                "timestamp": datetime.now().isoformat()
-            })
+            self._append_message(state, response, agent="ceo")
+            yield state
             
             # Simulate strategic meeting
             try:
-                meeting_result = await self.orchestrator.simulate_strategic_meeting(campaign_data)
-                state["current_strategy"] = meeting_result["final_strategy"]
-                state["active_agents"] = ["ceo", "cmo", "creative_director", "performance_manager"]
+                meeting_result = await self._run_strategic_meeting(state, campaign_data)
+                self._set_panel_data(state, "current_strategy", meeting_result["final_strategy"])
+                self._set_panel_data(state, "active_agents", ["ceo", "cmo", "creative_director", "performance_manager"])
                 
                 # CEO presents the strategy
                 strategy_summary = self._format_strategy_summary(meeting_result)
                 
-                state["conversation_history"].append({
-                    "type": "agent",
-                    "agent": "ceo",
-                    "content": f"🎉 **Strategy Complete!** Here's what our team has developed:\n\n{strategy_summary}\n\nWhat do you think? Should we proceed with content creation, or would you like to adjust anything?",
-                    "timestamp": datetime.now().isoformat()
-                })
+                self._append_message(state, f"🎉 **Strategy Complete!** Here's what our team has developed:\n\n{strategy_summary}\n\nWhat do you think? Should we proceed with content creation, or would you like to adjust anything?", agent="ceo")
                 
             except Exception as e:
                 # Fallback response
-                state["conversation_history"].append({
-                    "type": "agent",
-                    "agent": "ceo",
-                    "content": f"I'm having a brief technical moment with the team meeting. Let me continue working on your {campaign_data.get('topic', 'campaign')} strategy and get back to you shortly!",
-                    "timestamp": datetime.now().isoformat()
-                })
+                self._append_message(state, f"I'm having a brief technical moment with the team meeting. Let me continue working on your {campaign_data.get('topic', 'campaign')} strategy and get back to you shortly!", agent="ceo")
         
         else:
             # Continue gathering information
@@ -582,62 +877,54 @@ class ConversationalInterface:
             else:
                 response = f"Excellent! A {campaign_data['topic']} campaign for {campaign_data.get('target_audience', 'your audience')}. What's your main goal - brand awareness, sales, lead generation, or something else?"
             
-            state["conversation_history"].append({
-                "type": "agent",
-                "agent": "ceo",
-                "content": response,
-                "timestamp": datetime.now().isoformat()
-            })
+            self._append_message(state, response, agent="ceo")
         
-        return "", state
+        yield state
     
-    async def _handle_strategy_phase(self, message: str, state: Dict) -> Tuple[str, Dict]:
+    async def _handle_strategy_phase(self, message: str, state: Dict) -> AsyncIterator[Dict]:
         """Handle strategy discussion and refinement"""
         # Move to content phase
-        state["phase"] = "content"
-        
-        response = """
-        🎨 **Sofia (Creative Director):** Perfect! I'm excited about this strategy. Let me start creating some content variations for you.
-        
-        📊 **David (Performance Manager):** I'll also run some performance predictions so we know what to expect.
-        
-        ✍️ Ready to see your content options!
-        """
-        
-        state["conversation_history"].append({
-            "type": "agent",
-            "agent": "creative_director",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        return "", state
+        self._set_panel_data(state, "phase", "content")
+        
+        # Each specialist answers independently, so their replies are produced concurrently.
+        # return_exceptions keeps one failing agent from losing the other's reply.
+        speakers = ["creative_director", "performance_manager"]
+        replies = await asyncio.gather(
+            *(self._agent_reply(agent_key, message, state) for agent_key in speakers),
+            return_exceptions=True
+        )
+        
+        # Append in a fixed speaking order regardless of which reply finished first,
+        # as one batch so the UI receives both replies in a single update
+        batch = []
+        for agent_key, reply in zip(speakers, replies):
+            if isinstance(reply, Exception):
+                print(f"⚠️ {agent_key} reply failed: {reply}")
+                continue
+            batch.append((agent_key, reply))
+        self._extend_messages(state, batch)
+        
+        yield state
+    
+    async def _agent_reply(self, agent_key: str, message: str, state: Dict) -> str:
+        """Produce one agent's reply during the strategy discussion"""
+        return STRATEGY_PHASE_REPLIES[agent_key]
     
-    async def _handle_content_phase(self, message: str, state: Dict) -> Tuple[str, Dict]:
+    async def _handle_content_phase(self, message: str, state: Dict) -> AsyncIterator[Dict]:
         """Handle content creation phase"""
         response = "🚀 Content creation is in progress! Our team is working on multiple variations for you to choose from."
         
-        state["conversation_history"].append({
-            "type": "agent",
-            "agent": "creative_director",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._append_message(state, response, agent="creative_director")
         
-        return "", state
+        yield state
     
-    async def _handle_general_conversation(self, message: str, state: Dict) -> Tuple[str, Dict]:
+    async def _handle_general_conversation(self, message: str, state: Dict) -> AsyncIterator[Dict]:
         """Handle general conversation"""
         response = "I'm here to help with your marketing campaigns! What would you like to work on today?"
         
-        state["conversation_history"].append({
-            "type": "agent",
-            "agent": "ceo",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._append_message(state, response, agent="ceo")
         
-        return "", state
+        yield state
     
     def _format_strategy_summary(self, meeting_result: Dict) -> str:
         """Format the strategy meeting results for display"""
@@ -684,4 +971,7 @@ def create_conversational_interface() -> gr.Blocks:
 if __name__ == "__main__":
     # Test the interface
     interface = create_conversational_interface()
-    interface.launch(server_name="127.0.0.1", server_port=7861, share=False)
+    # Queue events so sessions run concurrently and streamed replies go over websockets
+    interface.queue(max_size=32, default_concurrency_limit=8).launch(
+        server_name="127.0.0.1", server_port=7861, share=False, max_threads=64
+    )
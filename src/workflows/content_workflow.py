@@ -1,8 +1,21 @@
+import asyncio
+import contextlib
+import functools
 from typing import TypedDict, Optional
 from langgraph.graph import StateGraph, END
 
 from src.agents.core.content_strategy import ContentStrategyAgent
 
+# Persisting checkpoints lets a failed run resume from its last completed node
+try:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    CHECKPOINTING_AVAILABLE = True
+except ImportError:
+    print("SQLite checkpointing not available - workflows will run without checkpoints")
+    CHECKPOINTING_AVAILABLE = False
+
+CHECKPOINT_DB = "workflow_ckpt.db"
+
 # Define the state for our workflow
 class AgentState(TypedDict):
     """Represents the state of our workflow.
@@ -14,8 +27,9 @@ class AgentState(TypedDict):
     topic: str
     ideas: Optional[str]
 
-def create_content_workflow():
-    """Creates and compiles the content generation workflow graph."""
+@functools.lru_cache(maxsize=None)
+def _build_content_graph() -> StateGraph:
+    """Builds the uncompiled workflow graph, shared by every compiled app."""
     print("--- CREATING CONTENT WORKFLOW ---")
     
     # Initialize the agent
@@ -24,17 +38,55 @@ def create_content_workflow():
     # Create a new state graph
     workflow = StateGraph(AgentState)
 
+    async def strategist_node(state: AgentState) -> dict:
+        """Run the blocking strategist in a worker thread so concurrent workflows overlap."""
+        return await asyncio.to_thread(content_strategist, state)
+
     # Add the content strategist as a node in the graph
-    workflow.add_node("strategist", content_strategist)
+    workflow.add_node("strategist", strategist_node)
 
     # The graph starts at the 'strategist' node
     workflow.set_entry_point("strategist")
 
     # The graph ends after the 'strategist' node has run
     workflow.add_edge("strategist", END)
+    return workflow
 
+@functools.lru_cache(maxsize=1)
+def create_content_workflow():
+    """Creates and compiles the content generation workflow graph.
+    
+    The strategist node is async, so run the app with `await app.ainvoke({"topic": ...})`.
+    The compiled app is built once and shared by later calls; the strategist agent keeps
+    no per-request state, so sharing it is safe. Use `checkpointed_content_workflow` for
+    runs that should be resumable.
+    """
     # Compile the graph into a runnable app
-    app = workflow.compile()
+    app = _build_content_graph().compile()
     
     print("--- CONTENT WORKFLOW CREATED AND COMPILED ---")
     return app
+
+@contextlib.asynccontextmanager
+async def checkpointed_content_workflow(checkpoint_path: str = CHECKPOINT_DB):
+    """Compiles the workflow with SQLite checkpoints for the duration of the block.
+    
+    The saver's connection belongs to the running event loop, so the app is opened
+    inside the caller's loop and never cached:
+    
+        async with checkpointed_content_workflow() as app:
+            await app.ainvoke({"topic": ...}, config={"configurable": {"thread_id": workflow_id}})
+    
+    Invoking again with the same thread id resumes from the last completed node. Delete
+    the file for a fresh start. Without the SQLite checkpointer installed this yields the
+    plain, uncheckpointed app.
+    
+    Args:
+        checkpoint_path: SQLite file the state is checkpointed to after each node.
+    """
+    if not CHECKPOINTING_AVAILABLE:
+        yield create_content_workflow()
+        return
+    
+    async with AsyncSqliteSaver.from_conn_string(checkpoint_path) as checkpointer:
+        yield _build_content_graph().compile(checkpointer=checkpointer)